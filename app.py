@@ -1,14 +1,76 @@
 import streamlit as st
-import plotly.graph_objects as go
-from py3dbp import Packer, Bin, Item
-import decimal
+import math
+import os
+import time
 import random  # Needed for random color generation
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from packer_core import ALL_MODES, MAX_CONTAINER_SIDE, MAX_QTY, MIN_LENGTH, freeze_items, parse_items, search_placements, build_solution, analyze_failure, warm_up
+from plot_core import build_figure
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="Multi-Item Box Visualizer", layout="wide")
 st.title("📦 Multi-Item Shipping Calculator")
 st.markdown("**Logic:** Items are automatically sorted by **Volume (Largest to Smallest)** before packing.")
 
+# --- WARM-UP ---
+# Pay the Numba compile (or cache load) once per server process, not on the first click
+@st.cache_resource(show_spinner="Preparing solver...")
+def prepare_solver():
+    warm_up()
+    return True
+
+# Plotly loads its default template and trace validators with the first figure it
+# builds and serializes; do that with an empty box at startup too
+@st.cache_resource(show_spinner=False)
+def prepare_plotting():
+    build_figure((1.0, 1.0, 1.0), {'packed': [], 'unfitted': [], 'extent': [0.0, 0.0, 0.0]}).to_json()
+    return True
+
+prepare_solver()
+prepare_plotting()
+
+# One worker pool per server process; spawn avoids forking Streamlit's threads
+@st.cache_resource
+def get_executor():
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=get_context("spawn"))
+
+# Every UI update is a message to the browser: pass on at most one per interval,
+# however fast the solver reports
+def throttled(update, interval=0.1):
+    last = [0.0]
+    def report(fraction):
+        now = time.monotonic()
+        if now - last[0] >= interval:
+            last[0] = now
+            update(fraction)
+    return report
+
+# --- CACHED SOLVE ---
+# Same container + same item sizes -> same placements, whatever the names and colors;
+# underscore args are not hashed
+@st.cache_data(max_entries=64, show_spinner=False)
+def solve(cont_dims, shapes, _executor=None):
+    with st.status("Packing...") as status:
+        progress_bar = st.progress(0.0)
+
+        def show_progress(fraction):
+            progress_bar.progress(fraction)
+            status.update(label=f"Packing... {fraction:.0%}")
+
+        placements = search_placements(
+            shapes, cont_dims, modes=ALL_MODES, executor=_executor, progress=throttled(show_progress)
+        )
+        progress_bar.empty()
+        status.update(label="Packing done", state="complete", expanded=False)
+    return placements
+
+# One shared figure per (container, solution, mode): unpickling a cache_data copy costs
+# about as much as rebuilding it, and st.plotly_chart only reads the figure
+@st.cache_resource(max_entries=64, show_spinner=False)
+def render_figure(cont_dims, solution, wireframe=False):
+    return build_figure(cont_dims, solution, wireframe)
+
 # --- SESSION STATE INITIALIZATION ---
 if 'items_to_pack' not in st.session_state:
     st.session_state.items_to_pack = []
@@ -18,11 +80,29 @@ if 'status_msg' not in st.session_state:
 if 'status_type' not in st.session_state:
     st.session_state.status_type = ""
 
+# --- ITEM TABLE EDITS ---
+# Runs before the rerun: folds the table's cell edits and row deletions into the
+# item list, which the table is then redrawn from
+def apply_table_edits():
+    changes = st.session_state.items_editor
+    items = st.session_state.items_to_pack
+    for row, values in changes["edited_rows"].items():
+        items[int(row)].update(values)
+    for row in sorted(changes["deleted_rows"], reverse=True):
+        items.pop(row)
+
+    if changes["deleted_rows"]:
+        st.session_state.status_msg = f"❌ Removed {len(changes['deleted_rows'])} item(s) from list"
+        st.session_state.status_type = "error"
+    else:
+        st.session_state.status_msg = "✏️ Updated item list"
+        st.session_state.status_type = "info"
+
 # --- SIDEBAR: CONFIGURATION ---
 st.sidebar.header("1. Define Box (Inner Dims)")
-box_l = st.sidebar.number_input("Box Length", min_value=0.1, value=12.0)
-box_w = st.sidebar.number_input("Box Width", min_value=0.1, value=12.0)
-box_h = st.sidebar.number_input("Box Height", min_value=0.1, value=12.0)
+box_l = st.sidebar.number_input("Box Length", min_value=MIN_LENGTH, max_value=MAX_CONTAINER_SIDE, value=12.0)
+box_w = st.sidebar.number_input("Box Width", min_value=MIN_LENGTH, max_value=MAX_CONTAINER_SIDE, value=12.0)
+box_h = st.sidebar.number_input("Box Height", min_value=MIN_LENGTH, max_value=MAX_CONTAINER_SIDE, value=12.0)
 st.sidebar.caption("Weight capacity is disabled (Calculates by Size only)")
 
 st.sidebar.markdown("---")
@@ -30,12 +110,13 @@ st.sidebar.header("2. Add Items")
 item_name = st.sidebar.text_input("Item Name", value="Product A")
 
 c1, c2, c3 = st.sidebar.columns(3)
-i_l = c1.number_input("L", min_value=0.1, value=5.0)
-i_w = c2.number_input("W", min_value=0.1, value=5.0)
-i_h = c3.number_input("H", min_value=0.1, value=5.0)
+i_l = c1.number_input("L", min_value=MIN_LENGTH, value=5.0)
+i_w = c2.number_input("W", min_value=MIN_LENGTH, value=5.0)
+i_h = c3.number_input("H", min_value=MIN_LENGTH, value=5.0)
 
-i_qty = st.sidebar.number_input("Qty", value=1, min_value=1)
+i_qty = st.sidebar.number_input("Qty", value=1, min_value=1, max_value=MAX_QTY)
 
+# Actions run above the item list, so this same run already shows their result
 # --- ACTION: ADD ITEM (Auto Random Color) ---
 if st.sidebar.button("Add Item to List"):
     # Generate a random hex color
@@ -53,14 +134,34 @@ if st.sidebar.button("Add Item to List"):
     
     st.session_state.status_msg = f"✅ Successfully added {i_qty} x {item_name}"
     st.session_state.status_type = "success"
-    st.rerun()
+
+# --- ACTION: BULK ADD (one random color per line) ---
+with st.sidebar.expander("Paste Items"):
+    pasted_text = st.text_area("One per line: Name, L, W, H[, Qty]", placeholder="Product B, 4, 3, 2, 5")
+    if st.button("Add Pasted Items"):
+        rows, rejected = parse_items(pasted_text)
+        for name, l, w, h, qty in rows:
+            rand_color = "#{:06x}".format(random.randint(0, 0xFFFFFF))
+            for _ in range(qty):
+                st.session_state.items_to_pack.append({"name": name, "l": l, "w": w, "h": h, "color": rand_color})
+
+        added = sum(row[4] for row in rows)
+        if rejected:
+            st.session_state.status_msg = f"⚠️ Added {added} items; skipped {len(rejected)} unreadable line(s)"
+            st.session_state.status_type = "error"
+        else:
+            st.session_state.status_msg = f"✅ Successfully added {added} pasted items"
+            st.session_state.status_type = "success"
 
 # --- ACTION: CLEAR LIST ---
 if st.sidebar.button("Clear Entire List"):
     st.session_state.items_to_pack = []
     st.session_state.status_msg = "🧹 List cleared successfully"
     st.session_state.status_type = "info"
-    st.rerun()
+
+st.sidebar.markdown("---")
+st.sidebar.header("3. Display")
+wireframe_only = st.sidebar.checkbox("Fast wireframe mode", help="Draw items as outlines; lighter for long lists and slow devices")
 
 # --- MAIN PANEL: ITEM LIST ---
 st.subheader(f"Current Item List ({len(st.session_state.items_to_pack)} items)")
@@ -76,174 +177,61 @@ if st.session_state.status_msg:
     st.session_state.status_type = ""
 
 if len(st.session_state.items_to_pack) > 0:
-    c1, c2, c3, c4, c5, c6 = st.columns([0.5, 2.5, 2, 1, 0.5, 0.5])
-    c1.markdown("**No.**")
-    c2.markdown("**Name**")
-    c3.markdown("**Dims (LxWxH)**")
-    c4.markdown("**Color**")
-    c5.markdown("**Swap**")
-    c6.markdown("**Del**")
-    
-    st.markdown("---")
-
-    for i, item in enumerate(st.session_state.items_to_pack):
-        c1, c2, c3, c4, c5, c6 = st.columns([0.5, 2.5, 2, 1, 0.5, 0.5])
-        
-        with c1: st.write(f"#{i+1}")
-        with c2: st.write(item['name'])
-        with c3: st.write(f"{item['l']} x {item['w']} x {item['h']}")
-        with c4: st.color_picker("", item['color'], disabled=True, label_visibility="collapsed", key=f"col_{i}")
-        
-        with c5:
-            if st.button("🔄", key=f"swap_list_{i}", help="Swap Width and Height"):
-                st.session_state.items_to_pack[i]['w'], st.session_state.items_to_pack[i]['h'] = \
-                st.session_state.items_to_pack[i]['h'], st.session_state.items_to_pack[i]['w']
-                st.session_state.status_msg = f"🔄 Swapped dimensions for {item['name']}"
-                st.session_state.status_type = "info"
-                st.rerun()
-        
-        with c6:
-            if st.button("🗑️", key=f"remove_{i}", help="Remove this item"):
-                removed_name = st.session_state.items_to_pack[i]['name']
-                st.session_state.items_to_pack.pop(i)
-                st.session_state.status_msg = f"❌ Removed {removed_name} from list"
-                st.session_state.status_type = "error"
-                st.rerun()
+    # One grid widget instead of a row of columns and buttons per item
+    st.data_editor(
+        st.session_state.items_to_pack,
+        key="items_editor",
+        on_change=apply_table_edits,
+        num_rows="delete",
+        hide_index=True,
+        column_config={
+            "name": st.column_config.TextColumn("Name", required=True),
+            "l": st.column_config.NumberColumn("L", min_value=MIN_LENGTH, required=True),
+            "w": st.column_config.NumberColumn("W", min_value=MIN_LENGTH, required=True),
+            "h": st.column_config.NumberColumn("H", min_value=MIN_LENGTH, required=True),
+            "color": st.column_config.TextColumn("Color", disabled=True),
+        },
+    )
 else:
     st.info("Add items from the sidebar to start.")
 
-# --- VISUALIZATION FUNCTIONS ---
-def get_cube_trace(x, y, z, l, w, h, color, name, opacity=1.0):
-    x_pts = [x, x+l, x+l, x, x, x+l, x+l, x]
-    y_pts = [y, y, y+w, y+w, y, y, y+w, y+w]
-    z_pts = [z, z, z, z, z+h, z+h, z+h, z+h]
-
-    return go.Mesh3d(
-        x=x_pts, y=y_pts, z=z_pts,
-        i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2],
-        j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3],
-        k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
-        opacity=opacity,
-        color=color,
-        name=name,
-        showscale=False,
-        hoverinfo='name'
-    )
-
-def get_wireframe(l, w, h):
-    pts = [
-        (0,0,0), (l,0,0), (l,w,0), (0,w,0), (0,0,0),
-        (0,0,h), (l,0,h), (l,w,h), (0,w,h), (0,0,h),
-        (0,0,h), (0,0,0), (l,0,0), (l,0,h),
-        (l,w,h), (l,w,0), (0,w,0), (0,w,h)
-    ]
-    X = [p[0] for p in pts]
-    Y = [p[1] for p in pts]
-    Z = [p[2] for p in pts]
-    return go.Scatter3d(x=X, y=Y, z=Z, mode='lines', line=dict(color='black', width=4), name='Bin Frame')
-
-def analyze_failure(bin_obj, item_obj):
-    bin_dims = sorted([float(bin_obj.width), float(bin_obj.height), float(bin_obj.depth)])
-    item_dims = sorted([float(item_obj.width), float(item_obj.height), float(item_obj.depth)])
-    
-    if any(i > b for i, b in zip(item_dims, bin_dims)):
-        return "❌ Item is too large for box (Dimensions mismatch)"
-    return "📦 Not enough remaining space (or fragmentation)"
-
 # --- CALCULATION LOGIC ---
 if st.button("Calculate Packing (Largest First)", type="primary"):
     if not st.session_state.items_to_pack:
         st.warning("Please add items first.")
     else:
-        sorted_items = sorted(
-            st.session_state.items_to_pack, 
-            key=lambda x: x['l'] * x['w'] * x['h'], 
-            reverse=True
-        )
-        
-        packer = Packer()
-        IGNORED_WEIGHT_LIMIT = 999999999 
-        packer.add_bin(Bin('MainBox', box_l, box_w, box_h, IGNORED_WEIGHT_LIMIT))
-
-        for i, item in enumerate(sorted_items):
-            p_item = Item(f"{item['name']}-{i}", item['l'], item['w'], item['h'], 1)
-            p_item.color = item['color'] 
-            packer.add_item(p_item)
-
-        packer.pack(bigger_first=True, distribute_items=False)
-        
-        box = packer.bins[0]
-        
+        cont_dims = (box_l, box_w, box_h)
+        specs = freeze_items(st.session_state.items_to_pack)
+        mode, packed = solve(cont_dims, tuple(spec[1:4] for spec in specs), _executor=get_executor())
+        solution = build_solution(specs, mode, packed)
+
         col1, col2 = st.columns([1, 3])
-        
+
         with col1:
             st.subheader("Results")
-            
+
             total_box_volume = box_l * box_w * box_h
-            packed_item_volume = 0
-            
-            for item in box.items:
-                 packed_item_volume += float(item.width) * float(item.height) * float(item.depth)
+            # fsum stays correctly rounded however many small items are added
+            packed_item_volume = math.fsum(w * h * d for _, _, _, _, _, w, h, d in solution['packed'])
 
             efficiency = (packed_item_volume / total_box_volume) * 100
-            
-            st.metric("Packed Items", len(box.items))
+
+            st.metric("Packed Items", len(solution['packed']))
             st.metric("Volume Utilization", f"{efficiency:.1f}%")
             st.caption(f"Used: {packed_item_volume:.2f} / Total: {total_box_volume:.2f}")
+            st.caption("Packed extent: {:.2f} x {:.2f} x {:.2f}".format(*solution['extent']))
 
-            if len(box.unfitted_items) == 0:
+            if len(solution['unfitted']) == 0:
                 st.success("✅ All items fit!")
             else:
-                st.error(f"❌ {len(box.unfitted_items)} items did NOT fit.")
-                
-                for item in box.unfitted_items:
-                    reason = analyze_failure(box, item)
-                    with st.expander(f"{item.name} (Failed)", expanded=True):
+                st.error(f"❌ {len(solution['unfitted'])} items did NOT fit.")
+
+                for name, _, l, w, h in solution['unfitted']:
+                    reason = analyze_failure(cont_dims, (l, w, h))
+                    with st.expander(f"{name} (Failed)", expanded=True):
                         st.write(f"**Reason:** {reason}")
-                        st.caption(f"Dims: {float(item.width)}x{float(item.height)}x{float(item.depth)}")
+                        st.caption(f"Dims: {l}x{w}x{h}")
 
         with col2:
-            max_x_draw = box_l
-            fig = go.Figure()
-            
-            fig.add_trace(get_wireframe(box_l, box_w, box_h))
-            
-            for item in box.items:
-                x, y, z = float(item.position[0]), float(item.position[1]), float(item.position[2])
-                w, h, d = float(item.get_dimension()[0]), float(item.get_dimension()[1]), float(item.get_dimension()[2])
-                color = getattr(item, 'color', 'gray')
-                fig.add_trace(get_cube_trace(x, y, z, w, h, d, color, item.name))
-
-            if len(box.unfitted_items) > 0:
-                gap = box_l * 0.1
-                start_x = box_l + gap
-                current_z = 0
-                
-                for item in box.unfitted_items:
-                    w, h, d = float(item.width), float(item.height), float(item.depth)
-                    color = getattr(item, 'color', 'red')
-                    fig.add_trace(get_cube_trace(start_x, 0, current_z, w, h, d, color, f"FAILED: {item.name}", opacity=0.5))
-                    
-                    current_z += d
-                    if (start_x + w) > max_x_draw:
-                        max_x_draw = start_x + w
-
-                fig.add_trace(go.Scatter3d(
-                    x=[start_x], y=[0], z=[current_z + 1],
-                    mode='text', text=['Did Not Fit'],
-                    textfont=dict(color='red', size=12)
-                ))
-
-            layout = go.Layout(
-                scene=dict(
-                    xaxis=dict(title='Length (x)', range=[0, max_x_draw * 1.1]),
-                    yaxis=dict(title='Width (y)', range=[0, max(box_w, box_l)]),
-                    zaxis=dict(title='Height (z)', range=[0, max(box_h, box_l)]),
-                    aspectmode='data'
-                ),
-                margin=dict(l=0, r=0, b=0, t=0),
-                height=600
-            )
-            
-            fig.update_layout(layout)
+            fig = render_figure(cont_dims, solution, wireframe_only)
             st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,758 @@
+import itertools
+import math
+import os
+from decimal import Decimal
+from concurrent.futures import FIRST_COMPLETED, wait
+import numpy as np
+from numba import njit
+
+# The greedy sweep works on sizes rounded to UNIT, counted in whole units. At each
+# pivot it tries the rotations in this order, as indices into the item's (l, w, h).
+UNIT = Decimal('0.001')
+UNITS_PER_LENGTH = 1000
+# Longest container side the UI accepts: every coordinate the packer sums stays far
+# inside int64 thousandths
+MAX_CONTAINER_SIDE = 1e6
+# Shortest side any input accepts (sidebar, item table and paste box alike): well
+# above UNIT, so no item rounds to zero size
+MIN_LENGTH = 0.1
+# Most copies one entry may add; far beyond what a single box holds, and low enough
+# that a stray extra digit can't flood the item list
+MAX_QTY = 1000
+PIVOT_ROTATIONS = np.array(((0, 1, 2), (1, 0, 2), (1, 2, 0), (2, 1, 0), (2, 0, 1), (0, 2, 1)), dtype=np.int64)
+
+# Moves tried by the local search over the extreme-point insertion order; it gives
+# up early after LOCAL_SEARCH_PATIENCE moves in a row without packing more. Each move
+# swaps two items (MOVE_SWAP), reverses the slice between them (MOVE_REVERSE) or
+# shuffles that slice (the rest).
+LOCAL_SEARCH_ITERATIONS = 200
+LOCAL_SEARCH_PATIENCE = 60
+MOVE_SWAP = 0.4
+MOVE_REVERSE = 0.3
+
+# Branch-and-bound gives up (keeping its best so far) after visiting this many nodes
+BNB_NODE_LIMIT = 20000
+EPS = 1e-9
+
+# (mode, ordering) trials handed to a worker process at a time
+TRIAL_CHUNKSIZE = 32
+MAX_CHUNKS_IN_FLIGHT = 2 * (os.cpu_count() or 1)
+
+# A mode maps simulated container axes onto real ones (sim axis i == real axis mode[i]).
+# The greedy sweep fills axis 0 first, so packing every axis permutation of the container
+# explores layouts a single orientation never reaches.
+IDENTITY_MODE = (0, 1, 2)
+ALL_MODES = tuple(itertools.permutations(range(3)))
+
+
+# --- INPUT ---
+def parse_items(text):
+    # "name, L, W, H[, qty]" per line -> (name, l, w, h, qty). float()/int() accept
+    # surrounding whitespace, so only the name is stripped. Lines that don't parse or
+    # have sizes below MIN_LENGTH or non-finite (nan, inf), or a qty outside 1..MAX_QTY,
+    # are returned separately so the UI can report them.
+    rows, rejected = [], []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        parts = line.split(',')
+        try:
+            l, w, h = float(parts[1]), float(parts[2]), float(parts[3])
+            qty = int(parts[4]) if len(parts) > 4 and parts[4].strip() else 1
+        except (IndexError, ValueError):
+            rejected.append(line)
+            continue
+        if not all(map(math.isfinite, (l, w, h))) or min(l, w, h) < MIN_LENGTH or not 1 <= qty <= MAX_QTY:
+            rejected.append(line)
+            continue
+        rows.append((parts[0].strip(), l, w, h, qty))
+    return rows, rejected
+
+
+def freeze_items(items):
+    # Session-state dicts -> hashable (label, l, w, h, color) tuples, largest volume first
+    ordered = sorted(items, key=lambda x: x['l'] * x['w'] * x['h'], reverse=True)
+    return tuple(
+        (f"{item['name']}-{i}", float(item['l']), float(item['w']), float(item['h']), item['color'])
+        for i, item in enumerate(ordered)
+    )
+
+
+# --- PACKING ---
+def pivot_sizes(specs, cont_dims):
+    # Per-spec inputs of pivot_arrays(): (l, w, h) rounded to 3 decimals and held as
+    # integer thousandths, so touching faces and container walls compare exactly, and
+    # the float volume of each spec. Items that can't fit alone never reach the packer;
+    # their rows stay zero, so no oversized size has to survive the conversion.
+    sizes = np.zeros((len(specs), 3), dtype=np.int64)
+    for i, (_, l, w, h, _) in enumerate(specs):
+        if fits_alone(cont_dims, (l, w, h)):
+            sizes[i] = [to_units(l), to_units(w), to_units(h)]
+    vols = np.array([l * w * h for _, l, w, h, _ in specs], dtype=np.float64)
+    return sizes, vols
+
+
+def to_units(value):
+    # Half-even rounding of the exact value to 0.001, as a count of thousandths
+    return int(Decimal(value).quantize(UNIT) / UNIT)
+
+
+def pivot_arrays(sizes, vols, sim_dims, order, need=0):
+    # Packs items in exactly the given order (sizes and vols from pivot_sizes(); the
+    # order holds only items that fit the container alone). The first item goes to the
+    # origin; each later one to the first pivot where it fits, pivots being one past
+    # each placed box's far face: every x face first, then y, z.
+    # At a pivot only the first rotation that stays inside the box is tried.
+    # Items that would overflow the container's volume are marked unfitted unpacked.
+    # Once even placing every remaining item can't reach need items, the rest are
+    # marked unfitted too: the caller already has a better trial.
+    # Returns arrays of the placed indices, their sim-axis (x, y, z, dx, dy, dz) rows
+    # and the unfitted indices.
+    order = np.array(order, dtype=np.int64)
+    # No pivot lies past the sum of every item's longest side, so a longer container
+    # side packs the same cut down to that, and stays within int64
+    reach = int(sizes.max(axis=1, initial=0).sum()) / UNITS_PER_LENGTH
+    box = np.array([to_units(min(d, reach)) for d in sim_dims], dtype=np.int64)
+    box_vol = sim_dims[0] * sim_dims[1] * sim_dims[2]
+    placed, mins, dims, fitted = _pivot_kernel(sizes, vols, order, box, box_vol, need)
+    return placed, np.hstack((mins, dims)) / UNITS_PER_LENGTH, order[~fitted]
+
+
+def orientations(dims):
+    # The distinct axis-aligned rotations of an item (1, 3 or 6 of them)
+    return sorted(set(itertools.permutations(dims)))
+
+
+def rotation_table(specs):
+    # Orientations of every spec as arrays for the Numba kernels: table[i, :counts[i]]
+    table = np.zeros((len(specs), 6, 3))
+    counts = np.zeros(len(specs), dtype=np.int64)
+    for i, spec in enumerate(specs):
+        unique = orientations(spec[1:4])
+        table[i, :len(unique)] = unique
+        counts[i] = len(unique)
+    return table, counts
+
+
+def extreme_point_pack(container, rotations, order):
+    # Greedy extreme-point placement: each item (rotations is rotation_table()'s pair)
+    # goes to the lowest (z, y, x) extreme point where some orientation fits. Placing a
+    # box at p turns p into three new extreme points, one past each of its far faces.
+    table, counts = rotations
+    k, placed, mins, dims = _ep_kernel(table, counts, np.array(order, dtype=np.int64),
+                                       np.array(container, dtype=np.float64))
+    packed = [(idx, *pos, *size) for idx, pos, size in zip(placed.tolist(), mins.tolist(), dims.tolist())]
+    placed_set = set(placed.tolist())
+    return packed, [idx for idx in order if idx not in placed_set]
+
+
+def local_search(container, rotations, order, iterations=LOCAL_SEARCH_ITERATIONS, seed=0,
+                 patience=LOCAL_SEARCH_PATIENCE, target=None):
+    # Swap, reverse or shuffle part of the insertion order and repack; keep the move
+    # unless it packs fewer items. Seeded, so the same inputs always give the same answer.
+    # Orders are remembered by their sequence of item shapes, so swapping two identical
+    # items or revisiting an order never triggers a repack
+    current = list(order)
+    shapes = {idx: tuple(rotations[0][idx, 0].tolist()) for idx in current}
+    seen = {tuple(shapes[idx] for idx in current)}
+    best = extreme_point_pack(container, rotations, current)
+    if len(current) < 2:
+        return best
+
+    # Every move's kind and pair of positions drawn up front as arrays; adding 1..n-1
+    # modulo n keeps the two positions distinct
+    rng = np.random.default_rng(seed)
+    kinds = rng.random(iterations)
+    firsts = rng.integers(0, len(current), iterations)
+    seconds = (firsts + rng.integers(1, len(current), iterations)) % len(current)
+    stale = 0
+    for kind, i, j in zip(kinds.tolist(), firsts.tolist(), seconds.tolist()):
+        if not best[1] or stale >= patience or (target is not None and len(best[0]) >= target):
+            break
+        stale += 1
+        # Each move rewrites current[lo:hi] in place; a rejected move restores that span
+        lo, hi = min(i, j), max(i, j) + 1
+        segment = current[lo:hi]
+        if kind < MOVE_SWAP:
+            current[lo], current[hi - 1] = current[hi - 1], current[lo]
+        elif kind < MOVE_SWAP + MOVE_REVERSE:
+            current[lo:hi] = segment[::-1]
+        else:
+            current[lo:hi] = [segment[k] for k in rng.permutation(hi - lo).tolist()]
+        key = tuple(shapes[idx] for idx in current)
+        if key in seen:
+            current[lo:hi] = segment
+            continue
+        seen.add(key)
+        result = extreme_point_pack(container, rotations, current)
+        if len(result[0]) >= len(best[0]):
+            if len(result[0]) > len(best[0]):
+                stale = 0
+            best = result
+        else:
+            current[lo:hi] = segment
+    return best
+
+
+def _best_local_search(container, rotations, starts, executor, target=None):
+    # Local search from each start order: serially one seed-0 run per start; with a pool,
+    # every (start, seed) pair for one seed per CPU is submitted at once. Seed 0 is
+    # always among them, so the pool never does worse than serial. The earliest
+    # (start, seed) wins ties, and once one reaches target the rest are skipped.
+    def reached(result):
+        return not result[1] or (target is not None and len(result[0]) >= target)
+
+    if executor is None:
+        runs = (local_search(container, rotations, start, target=target) for start in starts)
+    else:
+        futures = [executor.submit(local_search, container, rotations, start, seed=seed, target=target)
+                   for start in starts for seed in range(os.cpu_count() or 1)]
+        runs = (future.result() for future in futures)
+    best = None
+    for result in runs:
+        if best is None or len(result[0]) > len(best[0]):
+            best = result
+        if reached(best):
+            break
+    if executor is not None:
+        for future in futures:
+            future.cancel()
+    return best
+
+
+@njit(cache=True, fastmath=True)
+def _overlaps(x, y, z, dx, dy, dz, mins, maxs, k):
+    # Does the box at (x, y, z) of size (dx, dy, dz) intersect any of the first k placed boxes?
+    for j in range(k):
+        if (x + dx > mins[j, 0] + EPS and x < maxs[j, 0] - EPS and
+                y + dy > mins[j, 1] + EPS and y < maxs[j, 1] - EPS and
+                z + dz > mins[j, 2] + EPS and z < maxs[j, 2] - EPS):
+            return True
+    return False
+
+
+@njit(cache=True, fastmath=True)
+def _ep_kernel(table, counts, order, box):
+    # Compiled body of extreme_point_pack(). Only the (z, y, x) order of the points
+    # matters, so a used point is replaced by the last one instead of shifting the rest.
+    n = order.shape[0]
+    mins = np.empty((n, 3))
+    maxs = np.empty((n, 3))
+    placed = np.empty(n, dtype=np.int64)
+    points = np.zeros((1 + 3 * n, 3))
+    n_points = 1
+    k = 0
+
+    for idx in order:
+        best_p = -1
+        best_r = -1
+        bx = by = bz = 0.0
+        for r in range(counts[idx]):
+            dx, dy, dz = table[idx, r, 0], table[idx, r, 1], table[idx, r, 2]
+            for p in range(n_points):
+                x, y, z = points[p, 0], points[p, 1], points[p, 2]
+                if x + dx > box[0] + EPS or y + dy > box[1] + EPS or z + dz > box[2] + EPS:
+                    continue
+                if best_p >= 0 and (z > bz or (z == bz and (y > by or (y == by and x >= bx)))):
+                    continue
+                if _overlaps(x, y, z, dx, dy, dz, mins, maxs, k):
+                    continue
+                best_p, best_r = p, r
+                bx, by, bz = x, y, z
+
+        if best_p < 0:
+            continue
+        dx, dy, dz = table[idx, best_r, 0], table[idx, best_r, 1], table[idx, best_r, 2]
+        mins[k, 0], mins[k, 1], mins[k, 2] = bx, by, bz
+        maxs[k, 0], maxs[k, 1], maxs[k, 2] = bx + dx, by + dy, bz + dz
+        placed[k] = idx
+        k += 1
+        n_points -= 1
+        points[best_p] = points[n_points]
+        points[n_points, 0], points[n_points, 1], points[n_points, 2] = bx + dx, by, bz
+        points[n_points + 1, 0], points[n_points + 1, 1], points[n_points + 1, 2] = bx, by + dy, bz
+        points[n_points + 2, 0], points[n_points + 2, 1], points[n_points + 2, 2] = bx, by, bz + dz
+        n_points += 3
+
+    return k, placed[:k], mins[:k], maxs[:k] - mins[:k]
+
+
+@njit(cache=True)
+def _pivot_overlaps(pivot, size, mins, dims, k):
+    # Strict overlap on every axis with any of the first k placed boxes, comparing
+    # doubled centers so the integer test stays exact
+    for j in range(k):
+        hit = True
+        for a in range(3):
+            if abs(2 * (pivot[a] - mins[j, a]) + size[a] - dims[j, a]) >= size[a] + dims[j, a]:
+                hit = False
+                break
+        if hit:
+            return True
+    return False
+
+
+@njit(cache=True)
+def _pivot_kernel(sizes, vols, order, box, box_vol, need):
+    # Compiled body of pivot_arrays(). No fastmath: the volume skip must round exactly
+    # like the Python sum it stands in for.
+    n = order.shape[0]
+    mins = np.empty((n, 3), dtype=np.int64)
+    dims = np.empty((n, 3), dtype=np.int64)
+    placed = np.empty(n, dtype=np.int64)
+    fitted = np.zeros(n, dtype=np.bool_)
+    pivot = np.zeros(3, dtype=np.int64)
+    size = np.empty(3, dtype=np.int64)
+    k = 0
+    used_vol = 0.0
+
+    for t in range(n):
+        if k + n - t < need:
+            break
+        idx = order[t]
+        if used_vol + vols[idx] > box_vol + EPS:
+            continue
+        for p in range(max(1, 3 * k)):
+            if k > 0:
+                axis, j = p // k, p % k
+                pivot[:] = mins[j]
+                pivot[axis] += dims[j, axis]
+            for r in range(6):
+                for a in range(3):
+                    size[a] = sizes[idx, PIVOT_ROTATIONS[r, a]]
+                if (pivot[0] + size[0] > box[0] or pivot[1] + size[1] > box[1] or
+                        pivot[2] + size[2] > box[2]):
+                    continue
+                if not _pivot_overlaps(pivot, size, mins, dims, k):
+                    mins[k] = pivot
+                    dims[k] = size
+                    placed[k] = idx
+                    fitted[t] = True
+                break
+            if fitted[t]:
+                k += 1
+                used_vol += vols[idx]
+                break
+
+    return placed[:k], mins[:k], dims[:k], fitted
+
+
+@njit(cache=True, fastmath=True)
+def _fit_by_volume(vols, depth, free_vol):
+    # Items are sorted by descending volume, so walk the tail smallest first
+    fit = 0
+    for i in range(vols.shape[0] - 1, depth - 1, -1):
+        if vols[i] > free_vol + EPS:
+            break
+        free_vol -= vols[i]
+        fit += 1
+    return fit
+
+
+@njit(cache=True, fastmath=True)
+def _bnb_kernel(rots, n_rots, vols, same_as_prev, box, best_count, node_limit):
+    # Iterative form of the depth-first search in solve_bnb(). Frame d holds the
+    # sorted corner coordinates seen at depth d and a (rotation, z, y, x) cursor
+    # into them, so a frame resumes exactly where its last child was entered.
+    # Identical items are interchangeable: once one is skipped, later copies are
+    # skipped too, so each multiset of chosen items is only explored once.
+    n = rots.shape[0]
+    box_vol = box[0] * box[1] * box[2]
+
+    placed_mins = np.empty((n, 3))
+    placed_maxs = np.empty((n, 3))
+    placed_item = np.empty(n, dtype=np.int64)
+    best_mins = np.empty((n, 3))
+    best_maxs = np.empty((n, 3))
+    best_item = np.empty(n, dtype=np.int64)
+    found = 0
+
+    corners = np.empty((n + 1, 3, n + 1))
+    n_corners = np.zeros((n + 1, 3), dtype=np.int64)
+    cursor = np.zeros((n + 1, 4), dtype=np.int64)
+    skipped = np.zeros(n + 1, dtype=np.bool_)
+    count_at = np.zeros(n + 1, dtype=np.int64)
+    used_at = np.zeros(n + 1)
+    tmp = np.empty(n + 1)
+
+    nodes = 0
+    depth = 0
+    count = 0
+    used = 0.0
+    entering = True
+    while depth >= 0:
+        if entering:
+            entering = False
+            nodes += 1
+            if nodes > node_limit:
+                break
+            if count > best_count:
+                best_count = count
+                found = count
+                best_mins[:count] = placed_mins[:count]
+                best_maxs[:count] = placed_maxs[:count]
+                best_item[:count] = placed_item[:count]
+            if best_count == n:
+                break
+            if depth == n or count + _fit_by_volume(vols, depth, box_vol - used) <= best_count:
+                depth -= 1
+                continue
+
+            for axis in range(3):
+                tmp[0] = 0.0
+                tmp[1:count + 1] = placed_maxs[:count, axis]
+                values = np.sort(tmp[:count + 1])
+                m = 0
+                for v in values:
+                    if m == 0 or v != corners[depth, axis, m - 1]:
+                        corners[depth, axis, m] = v
+                        m += 1
+                n_corners[depth, axis] = m
+            cursor[depth, :] = 0
+            if same_as_prev[depth] and not (count > 0 and placed_item[count - 1] == depth - 1):
+                cursor[depth, 0] = n_rots[depth]
+            skipped[depth] = False
+            count_at[depth] = count
+            used_at[depth] = used
+
+        count = count_at[depth]
+        used = used_at[depth]
+        nx, ny, nz = n_corners[depth, 0], n_corners[depth, 1], n_corners[depth, 2]
+        r, iz, iy, ix = cursor[depth, 0], cursor[depth, 1], cursor[depth, 2], cursor[depth, 3]
+        placed = False
+        while r < n_rots[depth] and not placed:
+            dx, dy, dz = rots[depth, r, 0], rots[depth, r, 1], rots[depth, r, 2]
+            while iz < nz and not placed:
+                z = corners[depth, 2, iz]
+                if z + dz > box[2] + EPS:
+                    break
+                while iy < ny and not placed:
+                    y = corners[depth, 1, iy]
+                    if y + dy > box[1] + EPS:
+                        break
+                    while ix < nx:
+                        x = corners[depth, 0, ix]
+                        if x + dx > box[0] + EPS:
+                            break
+                        ix += 1
+                        if not _overlaps(x, y, z, dx, dy, dz, placed_mins, placed_maxs, count):
+                            placed_mins[count, 0], placed_mins[count, 1], placed_mins[count, 2] = x, y, z
+                            placed_maxs[count, 0], placed_maxs[count, 1], placed_maxs[count, 2] = x + dx, y + dy, z + dz
+                            placed_item[count] = depth
+                            placed = True
+                            break
+                    if not placed:
+                        ix = 0
+                        iy += 1
+                if not placed:
+                    iy = 0
+                    ix = 0
+                    iz += 1
+            if not placed:
+                iz = 0
+                iy = 0
+                ix = 0
+                r += 1
+        cursor[depth, 0], cursor[depth, 1], cursor[depth, 2], cursor[depth, 3] = r, iz, iy, ix
+
+        if placed:
+            count += 1
+            used += vols[depth]
+            depth += 1
+            entering = True
+        elif not skipped[depth]:
+            # Leave this item out and try to do better with the rest
+            skipped[depth] = True
+            depth += 1
+            entering = True
+        else:
+            depth -= 1
+
+    return found, best_item[:found], best_mins[:found], best_maxs[:found] - best_mins[:found]
+
+
+def solve_bnb(container, specs, best_count=0, node_limit=BNB_NODE_LIMIT):
+    # Depth-first search over (item, orientation, corner) placements. Items are taken
+    # largest first and each one is either placed at a candidate corner or skipped.
+    # Candidate corners are every combination of the far faces placed so far on each
+    # axis. Returns the best placement list found that beats best_count, or None.
+    n = len(specs)
+    # Group items with the same dimension signature next to each other, still largest first
+    signatures = [tuple(sorted(round(d, 4) for d in spec[1:4])) for spec in specs]
+    vols = [spec[1] * spec[2] * spec[3] for spec in specs]
+    order = sorted(range(n), key=lambda i: (-vols[i], signatures[i]))
+
+    table, counts = rotation_table(specs)
+    rots, n_rots = table[order], counts[order]
+    same_as_prev = np.zeros(n, dtype=np.bool_)
+    for d, i in enumerate(order):
+        same_as_prev[d] = d > 0 and signatures[i] == signatures[order[d - 1]]
+    box = np.array(container, dtype=np.float64)
+
+    found, item_idx, mins, dims = _bnb_kernel(
+        rots, n_rots, np.array([vols[i] for i in order]), same_as_prev, box, best_count, node_limit
+    )
+    if found == 0:
+        return None
+    return [
+        (order[d], *pos, *size)
+        for d, pos, size in zip(item_idx.tolist(), mins.tolist(), dims.tolist())
+    ]
+
+
+def warm_up():
+    # Compile (or load from the on-disk cache) the greedy, extreme-point and tree-search kernels
+    specs = (('warm-up', 1.0, 1.0, 1.0, ''),) * 2
+    pivot_arrays(*pivot_sizes(specs, (1.0, 1.0, 1.0)), (1.0, 1.0, 1.0), [0, 1])
+    extreme_point_pack((1.0, 1.0, 1.0), rotation_table(specs), [0, 1])
+    solve_bnb((1.0, 1.0, 1.0), specs)
+
+
+def to_real_axes(values, mode):
+    real = [0.0, 0.0, 0.0]
+    for sim_axis, real_axis in enumerate(mode):
+        real[real_axis] = values[sim_axis]
+    return real
+
+
+def try_orders(specs, cont_dims, trials, first_index=0, target=None):
+    # Packs a run of (mode, ordering) trials, stopping early once everything fits or
+    # target items (an upper bound, so nothing can do better) are packed.
+    # Returns (trial_index, mode, count, bounding_volume, n_unfitted, packed) per trial
+    # that ran; top-level so it pickles. Trials are scored in order, so one that doesn't
+    # beat an earlier trial of the same run can never win: its packed is None, which
+    # keeps losing placements out of the results sent back from the pool. Trials are
+    # scored on the packer's arrays; only a run's new best is turned into tuples.
+    results = []
+    sizes, vols = pivot_sizes(specs, cont_dims)
+    run_best = None
+    for t, (mode, order) in enumerate(trials, start=first_index):
+        sim_dims = tuple(cont_dims[axis] for axis in mode)
+        # A trial packing fewer items than this run's best can't win, so stop it early
+        need = run_best[0] if run_best is not None else 0
+        placed, boxes, unfitted = pivot_arrays(sizes, vols, sim_dims, order, need)
+        volume = extent_stats(boxes)[0]
+        key = (len(placed), -volume, -t)
+        packed = None
+        if run_best is None or key > run_best:
+            run_best = key
+            packed = [(idx, *row) for idx, row in zip(placed.tolist(), boxes.tolist())]
+        results.append((t, mode, key[0], volume, len(unfitted), packed))
+        if not len(unfitted) or (target is not None and key[0] >= target):
+            break
+    return results
+
+
+def _chunks(trials, size):
+    # (first_index, list) runs of a lazy trial stream
+    for start in itertools.count(0, size):
+        chunk = list(itertools.islice(trials, size))
+        if not chunk:
+            return
+        yield start, chunk
+
+
+def _sweep(specs, cont_dims, trials, executor, target=None):
+    # Yields trial results, serially or from the process pool. trials is consumed lazily;
+    # the pool only ever holds MAX_CHUNKS_IN_FLIGHT chunks, running or waiting to be
+    # yielded. Once some trial fits everything (or reaches target), later trials are
+    # cancelled. Chunks are yielded in trial order and none past that stopping trial,
+    # so the pool yields exactly the results a serial sweep would.
+    if executor is None:
+        yield from try_orders(specs, cont_dims, trials, target=target)
+        return
+
+    chunks = _chunks(iter(trials), TRIAL_CHUNKSIZE)
+    pending, finished = {}, {}
+    next_start = 0
+    stop_at = None
+    while True:
+        # A chunk past the stopping trial is never yielded, even if it finished first
+        while next_start in finished and (stop_at is None or next_start <= stop_at):
+            yield from finished.pop(next_start)
+            next_start += TRIAL_CHUNKSIZE
+        if stop_at is not None and next_start > stop_at:
+            return
+
+        while stop_at is None and len(pending) + len(finished) < MAX_CHUNKS_IN_FLIGHT:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            pending[executor.submit(try_orders, specs, cont_dims, chunk[1], chunk[0], target)] = chunk[0]
+        if not pending:
+            return
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            start = pending.pop(future)
+            if future.cancelled():
+                continue
+            results = future.result()
+            finished[start] = results
+            t, _, count, _, n_unfitted, _ = results[-1]
+            if not n_unfitted or (target is not None and count >= target):
+                stop_at = t if stop_at is None else min(stop_at, t)
+                for other, other_start in list(pending.items()):
+                    if other_start > stop_at and other.cancel():
+                        del pending[other]
+
+
+def volume_bound(dims, box_vol):
+    # Most items that could ever fit by volume alone: the smallest ones first
+    vols = np.sort(dims.prod(axis=1))
+    return int(np.searchsorted(np.cumsum(vols), box_vol + EPS, side='right'))
+
+
+def spec_dims(specs):
+    # The (l, w, h) of every spec as one (n, 3) float array, read once per search
+    return np.array([spec[1:4] for spec in specs], dtype=np.float64).reshape(-1, 3)
+
+
+def heuristic_orderings(dims):
+    # Largest volume, longest side and biggest footprint first, from spec_dims();
+    # stable sorts keep the freeze_items() order among equal keys
+    keys = (dims.prod(axis=1), dims.max(axis=1), dims[:, 0] * dims[:, 1])
+    return [tuple(np.argsort(-key, kind='stable').tolist()) for key in keys]
+
+
+def distinct_modes(cont_dims, modes):
+    # Modes giving the same simulated container pack identically; keep the first of
+    # each (a cube needs one mode, a box with two equal sides three)
+    firsts = {}
+    for mode in modes:
+        firsts.setdefault(tuple(cont_dims[axis] for axis in mode), mode)
+    return tuple(firsts.values())
+
+
+def _distinct_orders(dims, orderings, feasible_set):
+    # The greedy sweep packs by dimensions alone, so orderings that differ only by swapping
+    # identical items pack identically; yield each distinct one once (k identical
+    # items cut a full permutation sweep by k!)
+    keys = [tuple(row) for row in np.round(dims, 4).tolist()]
+    seen = set()
+    for order in orderings:
+        filtered = tuple(idx for idx in order if idx in feasible_set)
+        key = tuple(keys[idx] for idx in filtered)
+        if key not in seen:
+            seen.add(key)
+            yield filtered
+
+
+def search_placements(shapes, cont_dims, modes=(IDENTITY_MODE,), orderings=None, n_orderings=None,
+                      executor=None, progress=None):
+    # Tries every (item ordering, container mode) pair and keeps the one packing the most
+    # items, preferring the tighter bounding box and then the earliest trial on ties.
+    # orderings may be any iterable, e.g. a lazy itertools.permutations(); pass n_orderings
+    # when it has no len(). progress(fraction) is called at most ~10 times, since every
+    # UI update is a round-trip to the browser.
+    # Only the (l, w, h) shapes matter, so callers can cache on them alone; returns the
+    # mode and sim-axis placements (idx, x, y, z, dx, dy, dz) for build_solution().
+    specs = tuple(('', l, w, h, '') for l, w, h in shapes)
+    modes = distinct_modes(cont_dims, modes)
+
+    # Items that cannot fit even alone are left out of every search up front
+    # (the vectorized form of fits_alone() over every spec at once)
+    dims = spec_dims(specs)
+    fits = np.all(np.sort(dims, axis=1) <= np.sort(cont_dims) + EPS, axis=1)
+    feasible = np.flatnonzero(fits).tolist()
+    feasible_set = set(feasible)
+    bound = volume_bound(dims[feasible], float(np.prod(cont_dims)))
+    if orderings is None:
+        orderings = [tuple(range(len(specs)))]
+    if n_orderings is None and hasattr(orderings, '__len__'):
+        n_orderings = len(orderings)
+    total = len(modes) * n_orderings if n_orderings else None
+    stride = max(1, total // 10) if total else None
+
+    trials = (
+        (mode, order)
+        for order in _distinct_orders(dims, orderings, feasible_set)
+        for mode in modes
+    )
+    # Ties on packed count go to the tighter bounding box, then to the earlier trial
+    best, best_key = None, None
+    sweep = _sweep(specs, cont_dims, trials, executor, bound)
+    for done, (t, mode, count, volume, _, packed) in enumerate(sweep, start=1):
+        key = (count, -volume, -t)
+        if best_key is None or key > best_key:
+            best, best_key = (t, mode, packed), key
+        if progress is not None and stride and done % stride == 0:
+            progress(min(done / total, 1.0))
+    best = best[1:]
+
+    # The greedy sweep is the fallback; the extreme-point heuristic and then
+    # the tree search each try to beat the best so far, unless it already packs as
+    # many items as the volume bound allows
+    if len(best[1]) < bound:
+        rotations = rotation_table(specs)
+        # Local search from each sort-key heuristic; the first start wins ties. With
+        # repeated items the heuristics often agree shape for shape, and such starts
+        # would only repeat the same searches
+        starts = [list(order) for order in _distinct_orders(dims, heuristic_orderings(dims), feasible_set)]
+        ep_packed, _ = _best_local_search(cont_dims, rotations, starts, executor, bound)
+        if len(ep_packed) > len(best[1]):
+            best = (IDENTITY_MODE, ep_packed)
+    if len(best[1]) < bound:
+        improved = solve_bnb(cont_dims, [specs[idx] for idx in feasible], best_count=len(best[1]))
+        if improved is not None:
+            best = (IDENTITY_MODE, [(feasible[j], *box) for j, *box in improved])
+    if progress is not None:
+        progress(1.0)
+    return best
+
+
+def build_solution(specs, mode, packed):
+    # Placements in real axes with each spec's name and color, plus every spec left out
+    packed_idx = {placement[0] for placement in packed}
+    unfitted = [idx for idx in range(len(specs)) if idx not in packed_idx]
+    solution = {'packed': [], 'unfitted': [], 'extent': to_real_axes(bounding_box_stats(packed)[1], mode)}
+    for idx, x, y, z, dx, dy, dz in packed:
+        name, _, _, _, color = specs[idx]
+        pos = to_real_axes((x, y, z), mode)
+        dims = to_real_axes((dx, dy, dz), mode)
+        solution['packed'].append((name, color, *pos, *dims))
+    for idx in unfitted:
+        name, l, w, h, color = specs[idx]
+        solution['unfitted'].append((name, color, l, w, h))
+    return solution
+
+
+# --- DIAGNOSTICS ---
+def bounding_box_stats(packed):
+    # Volume and (x, y, z) extent of the smallest box at the origin holding every
+    # placement (idx, x, y, z, dx, dy, dz); one vectorized max instead of a Python loop
+    if not packed:
+        return 0.0, (0.0, 0.0, 0.0)
+    return extent_stats(np.array(packed, dtype=np.float64)[:, 1:])
+
+
+def extent_stats(boxes):
+    # bounding_box_stats() for an (n, 6) array of (x, y, z, dx, dy, dz) rows
+    if not len(boxes):
+        return 0.0, (0.0, 0.0, 0.0)
+    extent = (boxes[:, :3] + boxes[:, 3:]).max(axis=0)
+    return float(extent.prod()), tuple(extent.tolist())
+
+
+def sort3(a, b, c):
+    # Three compare-swaps; no list to allocate, unlike sorted()
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b, c = c, b
+    if a > b:
+        a, b = b, a
+    return a, b, c
+
+
+def fits_alone(cont_dims, item_dims):
+    # Smallest side against smallest side, and so on: the best any rotation can do
+    i0, i1, i2 = sort3(*item_dims)
+    b0, b1, b2 = sort3(*cont_dims)
+    return i0 <= b0 + EPS and i1 <= b1 + EPS and i2 <= b2 + EPS
+
+
+def analyze_failure(cont_dims, item_dims):
+    if not fits_alone(cont_dims, item_dims):
+        return "❌ Item is too large for box (Dimensions mismatch)"
+    return "📦 Not enough remaining space (or fragmentation)"
@@ -0,0 +1,121 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# --- CUBE GEOMETRY (unit cube, scaled and shifted per box) ---
+_CUBE_UNIT_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=np.float64)
+_CUBE_I = np.array([7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2], dtype=np.int32)
+_CUBE_J = np.array([3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3], dtype=np.int32)
+_CUBE_K = np.array([0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6], dtype=np.int32)
+# One continuous pen path over all 12 edges: bottom ring, up, then the top ring with
+# three verticals walked down and back up
+_CUBE_PATH = np.array([0, 1, 2, 3, 0, 4, 5, 1, 5, 6, 2, 6, 7, 3, 7, 4], dtype=np.int32)
+
+
+# --- VISUALIZATION FUNCTIONS ---
+def get_cubes_trace(boxes, colors, names, opacity=1.0, hoverinfo='text'):
+    # All boxes (rows of x, y, z, l, w, h) in one Mesh3d: 8 vertices and 12 triangles
+    # each, with triangle indices offset per box and colors/hover text repeated to match
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    # float32 is plenty for drawing and halves the typed arrays sent to the browser
+    corners = (_CUBE_UNIT_CORNERS * boxes[:, None, 3:] + boxes[:, None, :3]).reshape(-1, 3).astype(np.float32)
+    offsets = 8 * np.arange(len(boxes), dtype=np.int32)[:, None]
+
+    return go.Mesh3d(
+        x=corners[:, 0], y=corners[:, 1], z=corners[:, 2],
+        i=(_CUBE_I + offsets).ravel(),
+        j=(_CUBE_J + offsets).ravel(),
+        k=(_CUBE_K + offsets).ravel(),
+        opacity=opacity,
+        facecolor=np.repeat(colors, len(_CUBE_I)),
+        text=np.repeat(names, len(_CUBE_UNIT_CORNERS)),
+        # Faces share corners, so smooth shading would blend normals across box edges
+        flatshading=True,
+        showscale=False,
+        hoverinfo=hoverinfo
+    )
+
+def get_outline_traces(boxes, colors, opacity=1.0):
+    # Boxes (rows of x, y, z, l, w, h) as outlines only: one Scatter3d line trace per
+    # color, each box a 16-point pen path with a NaN gap before the next
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    colors = np.asarray(colors)
+    corners = _CUBE_UNIT_CORNERS * boxes[:, None, 3:] + boxes[:, None, :3]
+    gaps = np.full((len(boxes), 1, 3), np.nan)
+    paths = np.concatenate((corners[:, _CUBE_PATH], gaps), axis=1).astype(np.float32)
+
+    traces = []
+    for color in dict.fromkeys(colors.tolist()):
+        points = paths[colors == color].reshape(-1, 3)
+        traces.append(go.Scatter3d(
+            x=points[:, 0], y=points[:, 1], z=points[:, 2],
+            mode='lines', line=dict(color=color, width=3),
+            opacity=opacity, hoverinfo='skip', showlegend=False
+        ))
+    return traces
+
+def get_wireframe(l, w, h):
+    # Every edge in one unbroken pen path; for 16 points plain lists validate faster
+    # than arrays
+    X, Y, Z = (_CUBE_UNIT_CORNERS * np.array((l, w, h)))[_CUBE_PATH].T.tolist()
+    return go.Scatter3d(x=X, y=Y, z=Z, mode='lines', line=dict(color='black', width=4), name='Bin Frame')
+
+def get_container_traces(l, w, h):
+    # Faint walls on the same Mesh3d pipeline as the items, plus the edge outline
+    walls = get_cubes_trace([(0, 0, 0, l, w, h)], ['lightgray'], ['Box'], opacity=0.08, hoverinfo='skip')
+    return [walls, get_wireframe(l, w, h)]
+
+def build_figure(cont_dims, solution, wireframe=False):
+    # wireframe draws items as outlines: a fraction of the mesh payload for big lists
+    box_l, box_w, box_h = cont_dims
+    max_x_draw = box_l
+    fig = go.Figure()
+
+    fig.add_traces(get_container_traces(box_l, box_w, box_h))
+
+    if solution['packed']:
+        names, colors, *boxes = zip(*solution['packed'])
+        if wireframe:
+            fig.add_traces(get_outline_traces(np.column_stack(boxes), colors))
+        else:
+            fig.add_trace(get_cubes_trace(np.column_stack(boxes), colors, names))
+
+    if len(solution['unfitted']) > 0:
+        gap = box_l * 0.1
+        start_x = box_l + gap
+
+        # Failed items stack upward beside the box: each starts where the last one ended
+        names, failed_colors, *dims = zip(*solution['unfitted'])
+        w, h, d = (np.asarray(dim, dtype=np.float64) for dim in dims)
+        tops = np.cumsum(d)
+        failed_boxes = np.column_stack((np.full_like(d, start_x), np.zeros_like(d), tops - d, w, h, d))
+        failed_names = [f"FAILED: {name}" for name in names]
+        current_z = float(tops[-1])
+        max_x_draw = max(max_x_draw, start_x + float(w.max()))
+
+        if wireframe:
+            fig.add_traces(get_outline_traces(failed_boxes, failed_colors, opacity=0.5))
+        else:
+            fig.add_trace(get_cubes_trace(failed_boxes, failed_colors, failed_names, opacity=0.5))
+
+        fig.add_trace(go.Scatter3d(
+            x=[start_x], y=[0], z=[current_z + 1],
+            mode='text', text=['Did Not Fit'],
+            textfont=dict(color='red', size=12)
+        ))
+
+    layout = go.Layout(
+        scene=dict(
+            xaxis=dict(title='Length (x)', range=[0, max_x_draw * 1.1]),
+            yaxis=dict(title='Width (y)', range=[0, max(box_w, box_l)]),
+            zaxis=dict(title='Height (z)', range=[0, max(box_h, box_l)]),
+            aspectmode='data'
+        ),
+        margin=dict(l=0, r=0, b=0, t=0),
+        height=600
+    )
+
+    fig.update_layout(layout)
+    return fig